@@ -3,33 +3,103 @@
 Main Flask application for Virtual Stock Trading Platform.
 """
 
+import hmac
 import os
+from decimal import Decimal
 from functools import wraps
+from typing import Annotated
 
+import msgspec
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 from flask import (
     Flask,
     render_template,
+    stream_template,
     request,
     redirect,
     url_for,
     session,
     jsonify,
     flash,
+    get_flashed_messages,
+    g,
 )
+from flask.json.provider import JSONProvider
 
 from aws_client import AwsClient
 
 load_dotenv()
 
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; serializes dataclasses natively."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_json_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_json_default),
+            mimetype="application/json",
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev-secret-key-change-in-production")
+# Don't re-issue the session cookie on requests that didn't change it
+app.config["SESSION_REFRESH_EACH_REQUEST"] = False
+
+# Server-side sessions in Redis when configured; signed cookies otherwise
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    import redis
+    from flask_session import Session
+
+    app.config.update(
+        SESSION_TYPE="redis",
+        SESSION_REDIS=redis.Redis.from_url(
+            REDIS_URL, max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+        ),
+        SESSION_PERMANENT=False,
+    )
+    Session(app)
 
 aws_client = AwsClient()
 
 # Admin password (change this!)
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
 
+# Largest page the admin dashboard will request per table
+ADMIN_PAGE_MAX = 500
+
+# Below this many holdings, pricing a portfolio in plain Python is faster
+VECTORIZE_MIN_HOLDINGS = 8
+
+
+class OrderRequest(msgspec.Struct):
+    """Body of POST /api/orders."""
+
+    symbol: str
+    side: str
+    quantity: Annotated[int, msgspec.Meta(gt=0)]
+
+
+# Non-strict so numeric strings like "5" still coerce to int
+_order_decoder = msgspec.json.Decoder(OrderRequest, strict=False)
+
 
 # ---------- Auth helpers ----------
 
@@ -37,7 +107,10 @@ def login_required(view_func):
     @wraps(view_func)
     def wrapper(*args, **kwargs):
         if "user_id" not in session:
+            if request.path.startswith("/api/"):
+                return jsonify({"error": "Not authenticated"}), 401
             return redirect(url_for("login"))
+        g.user_id = session["user_id"]
         return view_func(*args, **kwargs)
     return wrapper
 
@@ -52,10 +125,70 @@ def admin_required(view_func):
 
 
 def get_current_user():
-    user_id = session.get("user_id")
-    if not user_id:
-        return None
-    return aws_client.get_user_by_id(user_id)
+    # Memoized per request so repeated calls don't hit DynamoDB again
+    if "user" not in g:
+        user_id = g.get("user_id") or session.get("user_id")
+        email = session.get("email")
+        if not user_id:
+            g.user = None
+        elif email:
+            # Primary-key GetItem, served from DAX's item cache when enabled
+            user = aws_client.get_user_by_email(email)
+            g.user = user if user and user.user_id == user_id else None
+        else:
+            g.user = aws_client.get_user_by_id(user_id)
+    return g.user
+
+
+def value_holdings(holdings, stocks_map):
+    """Price each holding: current price, market value and unrealized P/L."""
+    if len(holdings) < VECTORIZE_MIN_HOLDINGS:
+        result = []
+        for h in holdings:
+            stock = stocks_map.get(h.symbol)
+            current_price = stock["price"] if stock else 0.0
+            market_value = h.quantity * current_price
+            cost = h.quantity * h.avg_buy_price
+            unrealized_pl = market_value - cost
+            result.append(
+                {
+                    "symbol": h.symbol,
+                    "quantity": h.quantity,
+                    "avg_buy_price": h.avg_buy_price,
+                    "current_price": round(current_price, 2),
+                    "market_value": round(market_value, 2),
+                    "unrealized_pl": round(unrealized_pl, 2),
+                }
+            )
+        return result
+
+    # Wide portfolios: one vectorized pass instead of a Python loop
+    n = len(holdings)
+    qty = np.fromiter((h.quantity for h in holdings), dtype=np.int64, count=n)
+    avg = np.fromiter((h.avg_buy_price for h in holdings), dtype=np.float64, count=n)
+    cur = np.fromiter(
+        (stocks_map[h.symbol]["price"] if h.symbol in stocks_map else 0.0 for h in holdings),
+        dtype=np.float64,
+        count=n,
+    )
+    market_value = qty * cur
+    unrealized_pl = market_value - qty * avg
+    return [
+        {
+            "symbol": h.symbol,
+            "quantity": h.quantity,
+            "avg_buy_price": h.avg_buy_price,
+            "current_price": c,
+            "market_value": mv,
+            "unrealized_pl": pl,
+        }
+        for h, c, mv, pl in zip(
+            holdings,
+            np.round(cur, 2).tolist(),
+            np.round(market_value, 2).tolist(),
+            np.round(unrealized_pl, 2).tolist(),
+        )
+    ]
 
 
 # ---------- Routes: Main Pages ----------
@@ -78,6 +211,7 @@ def signup():
         try:
             user = aws_client.create_user(email=email, password=password)
             session["user_id"] = user.user_id
+            session["email"] = user.email
             flash("Signup successful! Welcome!", "success")
             return redirect(url_for("dashboard"))
         except ValueError as e:
@@ -94,11 +228,13 @@ def login():
         password = request.form.get("password", "").strip()
         
         user = aws_client.get_user_by_email(email)
-        if not user or user.password != password:
+        # Called even when the email is unknown so both paths cost one KDF
+        if not aws_client.verify_password(user, password):
             flash("Invalid email or password.", "error")
             return redirect(url_for("login"))
 
         session["user_id"] = user.user_id
+        session["email"] = user.email
         flash("Logged in successfully.", "success")
         return redirect(url_for("dashboard"))
 
@@ -119,10 +255,13 @@ def dashboard():
     if not user:
         return redirect(url_for("login"))
     
-    holdings = aws_client.get_portfolio(user.user_id)
-    trades = aws_client.get_trades(user.user_id)
+    holdings, trades = aws_client.get_portfolio_and_trades(user.user_id)
     
-    return render_template(
+    # Stream so the page head reaches the browser while the rest renders.
+    # The session is saved before a streamed body is generated, so pop the
+    # flashed messages now; base.html then reads the request's cached copy.
+    get_flashed_messages(with_categories=True)
+    return stream_template(
         "dashboard.html",
         user=user,
         holdings=holdings,
@@ -137,7 +276,10 @@ def dashboard():
 def api_stocks():
     q = request.args.get("q", "").strip()
     stocks = aws_client.get_all_stocks(q)
-    return jsonify(stocks)
+    resp = jsonify(stocks)
+    # Prices only tick once a second; let the browser reuse the response
+    resp.headers["Cache-Control"] = "private, max-age=1"
+    return resp
 
 
 @app.route("/api/stocks/<symbol>")
@@ -157,30 +299,12 @@ def api_portfolio():
         return jsonify({"error": "Not authenticated"}), 401
     
     holdings = aws_client.get_portfolio(user.user_id)
-    stocks_map = {s["symbol"]: s for s in aws_client.get_all_stocks("")}
-
-    result = []
-    for h in holdings:
-        stock = stocks_map.get(h.symbol)
-        current_price = stock["price"] if stock else 0.0
-        market_value = h.quantity * current_price
-        cost = h.quantity * h.avg_buy_price
-        unrealized_pl = market_value - cost
-        result.append(
-            {
-                "symbol": h.symbol,
-                "quantity": h.quantity,
-                "avg_buy_price": h.avg_buy_price,
-                "current_price": round(current_price, 2),
-                "market_value": round(market_value, 2),
-                "unrealized_pl": round(unrealized_pl, 2),
-            }
-        )
+    stocks_map = aws_client.get_stocks_bulk([h.symbol for h in holdings])
 
     return jsonify(
         {
             "cash_balance": user.cash_balance,
-            "holdings": result,
+            "holdings": value_holdings(holdings, stocks_map),
         }
     )
 
@@ -193,7 +317,7 @@ def api_trades():
         return jsonify({"error": "Not authenticated"}), 401
     
     trades = aws_client.get_trades(user.user_id)
-    return jsonify([t.__dict__ for t in trades])
+    return jsonify(trades)
 
 
 @app.route("/api/orders", methods=["POST"])
@@ -203,16 +327,16 @@ def api_orders():
     if not user:
         return jsonify({"error": "Not authenticated"}), 401
     
-    data = request.get_json() or {}
-    symbol = (data.get("symbol") or "").upper().strip()
-    side = (data.get("side") or "").upper().strip()
-    
     try:
-        quantity = int(data.get("quantity", 0))
-    except (TypeError, ValueError):
-        quantity = 0
+        order = _order_decoder.decode(request.get_data())
+    except msgspec.DecodeError as e:
+        return jsonify({"error": str(e)}), 400
+
+    symbol = order.symbol.upper().strip()
+    side = order.side.upper().strip()
+    quantity = order.quantity
 
-    if not symbol or side not in ("BUY", "SELL") or quantity <= 0:
+    if not symbol or side not in ("BUY", "SELL"):
         return jsonify({"error": "symbol, side (BUY/SELL), quantity>0 required"}), 400
 
     stock = aws_client.get_stock(symbol)
@@ -223,13 +347,11 @@ def api_orders():
         trade = aws_client.execute_trade(
             user=user, symbol=symbol, side=side, qty=quantity, price=stock["price"]
         )
-        # Refresh user after trade
-        user = aws_client.get_user_by_id(user.user_id)
-        
+        # execute_trade updates the user's balance in place
         return jsonify(
             {
                 "message": "Trade executed successfully",
-                "trade": trade.__dict__,
+                "trade": trade,
                 "cash_balance": user.cash_balance,
             }
         )
@@ -243,7 +365,7 @@ def api_orders():
 def admin_login():
     if request.method == "POST":
         password = request.form.get("password", "")
-        if password == ADMIN_PASSWORD:
+        if hmac.compare_digest(password.encode(), ADMIN_PASSWORD.encode()):
             session["is_admin"] = True
             flash("Admin logged in successfully.", "success")
             return redirect(url_for("admin_dashboard"))
@@ -263,14 +385,36 @@ def admin_logout():
 @app.route("/admin/dashboard")
 @admin_required
 def admin_dashboard():
-    users = aws_client.admin_get_all_users()
-    trades = aws_client.admin_get_all_trades()
-    return render_template("admin_dashboard.html", users=users, trades=trades)
+    try:
+        limit = min(max(int(request.args.get("limit", 50)), 1), ADMIN_PAGE_MAX)
+    except ValueError:
+        limit = 50
+    users_cursor = request.args.get("users_cursor") or None
+    trades_cursor = request.args.get("trades_cursor") or None
+
+    try:
+        users, next_users_cursor = aws_client.admin_get_all_users(limit, users_cursor)
+        trades, next_trades_cursor = aws_client.admin_get_all_trades(limit, trades_cursor)
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("admin_dashboard"))
+
+    return render_template(
+        "admin_dashboard.html",
+        users=users,
+        trades=trades,
+        limit=limit,
+        users_cursor=users_cursor,
+        trades_cursor=trades_cursor,
+        next_users_cursor=next_users_cursor,
+        next_trades_cursor=next_trades_cursor,
+    )
 
 
 if __name__ == "__main__":
     # Production mode: disable debug, listen on all interfaces
     # On EC2, ensure security group allows port 5000 (or use port 80 with nginx)
+    # Under load, prefer: gunicorn --workers 2 --threads 16 app:app
     debug_mode = os.getenv("FLASK_ENV", "production") == "development"
     port = int(os.getenv("PORT", 5000))
     app.run(debug=debug_mode, host="0.0.0.0", port=port)
@@ -4,24 +4,133 @@ AWS services integration for Virtual Stock Trading Platform.
 Uses DynamoDB for data storage and SNS for trade notifications.
 """
 
+import atexit
+import base64
+import hmac
+import json
 import os
+import queue
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
-from botocore.exceptions import BotoCoreError, ClientError
-from boto3.dynamodb.conditions import Key, Attr
+import numpy as np
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 
 USE_AWS = os.getenv("USE_AWS", "false").lower() == "true"
 
+# Keep enough warm HTTPS connections for every worker thread
+BOTO_CONFIG = Config(
+    max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50")),
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+_boto_session: Optional[boto3.session.Session] = None
+
+_password_hasher = PasswordHasher()
+
+# Verified against when there's no real hash to check, so every login
+# attempt pays one KDF and response time doesn't reveal which emails exist
+_DUMMY_PASSWORD_HASH = _password_hasher.hash(uuid.uuid4().hex)
+
+# Seconds a simulated price tick is reused by get_all_stocks
+STOCKS_SNAPSHOT_TTL = 1.0
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def get_boto_session() -> boto3.session.Session:
+    """Return the process-wide boto3 session, creating it on first use."""
+    global _boto_session
+    if _boto_session is None:
+        _boto_session = boto3.session.Session()
+    return _boto_session
+
+
+def _to_dynamo(item: Dict[str, Any]) -> Dict[str, Dict]:
+    """Serialize a plain dict to low-level DynamoDB attribute values."""
+    return {
+        k: _serializer.serialize(Decimal(str(v)) if isinstance(v, float) else v)
+        for k, v in item.items()
+    }
+
+
+def _from_dynamo(cls, item: Dict[str, Dict]):
+    """Build a dataclass from a low-level DynamoDB item, ignoring extra attributes.
+
+    Numbers come back as Decimal and are converted to the field's annotated
+    type (int or float).
+    """
+    fields = cls.__dataclass_fields__
+    values = {}
+    for k, v in item.items():
+        if k not in fields:
+            continue
+        value = _deserializer.deserialize(v)
+        if isinstance(value, Decimal) and fields[k].type in (int, float):
+            value = fields[k].type(value)
+        values[k] = value
+    return cls(**values)
+
+
+def encode_cursor(key: Dict[str, Any]) -> str:
+    """Encode a pagination key as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid page cursor")
+    if not isinstance(key, dict):
+        raise ValueError("Invalid page cursor")
+    return key
+
+
+def scan_page(table, limit: int, start_key: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Dict]]:
+    """Scan up to `limit` items, following LastEvaluatedKey across 1 MB pages."""
+    items: List[Dict] = []
+    while True:
+        kwargs: Dict[str, Any] = {"Limit": limit - len(items)}
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        resp = table.scan(**kwargs)
+        items.extend(resp.get("Items", []))
+        start_key = resp.get("LastEvaluatedKey")
+        if not start_key or len(items) >= limit:
+            return items, start_key
+
+
+def _page_local(items: List, limit: int, cursor: Optional[str]) -> Tuple[List, Optional[str]]:
+    """Slice an in-memory list the same way scan_page pages a table."""
+    offset = decode_cursor(cursor).get("offset") if cursor else 0
+    if type(offset) is not int or offset < 0:
+        raise ValueError("Invalid page cursor")
+    end = offset + limit
+    next_cursor = encode_cursor({"offset": end}) if end < len(items) else None
+    return items[offset:end], next_cursor
+
 
 @dataclass
 class User:
     user_id: str
     email: str
-    password: str  # NOTE: In production, hash passwords
+    password: str  # argon2 hash
     cash_balance: float
 
 
@@ -54,17 +163,28 @@ class AwsClient:
         self._portfolio: Dict[str, Dict[str, Holding]] = {}
         self._trades: Dict[str, List[Trade]] = {}
 
-        # Simulated stock universe
-        self._stocks: Dict[str, Dict] = {
-            "AAPL": {"symbol": "AAPL", "companyName": "Apple Inc.", "price": 180.0},
-            "GOOG": {"symbol": "GOOG", "companyName": "Alphabet Inc.", "price": 135.0},
-            "AMZN": {"symbol": "AMZN", "companyName": "Amazon.com Inc.", "price": 155.0},
-            "TSLA": {"symbol": "TSLA", "companyName": "Tesla Inc.", "price": 220.0},
-            "MSFT": {"symbol": "MSFT", "companyName": "Microsoft Corp.", "price": 320.0},
-            "META": {"symbol": "META", "companyName": "Meta Platforms Inc.", "price": 350.0},
-            "NVDA": {"symbol": "NVDA", "companyName": "NVIDIA Corp.", "price": 450.0},
-            "NFLX": {"symbol": "NFLX", "companyName": "Netflix Inc.", "price": 420.0},
-        }
+        # Simulated stock universe as parallel arrays (one row per stock), so
+        # the price walk is a single vector op over self._prices
+        universe = [
+            ("AAPL", "Apple Inc.", 180.0),
+            ("GOOG", "Alphabet Inc.", 135.0),
+            ("AMZN", "Amazon.com Inc.", 155.0),
+            ("TSLA", "Tesla Inc.", 220.0),
+            ("MSFT", "Microsoft Corp.", 320.0),
+            ("META", "Meta Platforms Inc.", 350.0),
+            ("NVDA", "NVIDIA Corp.", 450.0),
+            ("NFLX", "Netflix Inc.", 420.0),
+        ]
+        self._symbols: List[str] = [sym for sym, _, _ in universe]
+        self._names: List[str] = [name for _, name, _ in universe]
+        self._prices = np.array([price for _, _, price in universe], dtype=np.float64)
+        self._sym_idx: Dict[str, int] = {sym: i for i, sym in enumerate(self._symbols)}
+        # Uppercased "SYMBOL Company Name" per row, so search is one substring test
+        self._stock_search: List[str] = [
+            f"{sym} {name}".upper() for sym, name in zip(self._symbols, self._names)
+        ]
+        # (tick time, full stock list) reused by get_all_stocks until it expires
+        self._stocks_snapshot: Tuple[float, List[Dict]] = (0.0, [])
 
         if self.use_aws:
             self._init_aws_clients()
@@ -72,17 +192,54 @@ class AwsClient:
     def _init_aws_clients(self) -> None:
         """Initialize AWS clients for DynamoDB and SNS."""
         region = os.getenv("AWS_REGION", "us-east-1")
+        session = get_boto_session()
         
-        # DynamoDB resource
-        self._dynamodb = boto3.resource("dynamodb", region_name=region)
+        # DynamoDB resource (shared across request threads)
+        self._dynamodb = session.resource("dynamodb", region_name=region, config=BOTO_CONFIG)
+        # Separate low-level client for raw attribute values: the resource's
+        # meta.client would re-encode the requests built by get_portfolio,
+        # get_trades and _trade_transact_items, and pre-decode query results
+        # before _from_dynamo sees them
+        self._dynamodb_client = session.client("dynamodb", region_name=region, config=BOTO_CONFIG)
         
         # SNS client
-        self._sns = boto3.client("sns", region_name=region)
+        self._sns = session.client("sns", region_name=region, config=BOTO_CONFIG)
+
+        # Worker pool for overlapping independent AWS reads
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("AWS_IO_WORKERS", "8")),
+            thread_name_prefix="aws-io",
+        )
+
+        # SNS publishes happen outside the request path
+        self._write_queue: queue.Queue = queue.Queue(
+            maxsize=int(os.getenv("AWS_WRITE_QUEUE_SIZE", "10000"))
+        )
+        threading.Thread(target=self._drain_writes, name="aws-writer", daemon=True).start()
+        atexit.register(self._flush_writes)
         
         # Table references
-        self._users_table = self._dynamodb.Table(
-            os.getenv("DYNAMODB_USERS_TABLE", "virtual_trading_users")
-        )
+        users_table_name = os.getenv("DYNAMODB_USERS_TABLE", "virtual_trading_users")
+        self._users_table_direct = self._dynamodb.Table(users_table_name)
+        self._users_table = self._users_table_direct
+        self._transact_client = self._dynamodb_client
+
+        # With DAX, single-user reads and writes go through its write-through
+        # item cache. Queries and scans stay on DynamoDB: the DAX query cache
+        # isn't invalidated by writes, so balances and holdings would go stale.
+        dax_endpoint = os.getenv("DAX_ENDPOINT")
+        if dax_endpoint:
+            from amazondax import AmazonDaxClient
+
+            dax = AmazonDaxClient.resource(
+                session=session, region_name=region, endpoint_url=dax_endpoint
+            )
+            self._users_table = dax.Table(users_table_name)
+            self._transact_client = AmazonDaxClient(
+                session=session, region_name=region, endpoint_url=dax_endpoint
+            )
+
+        self._users_by_id_index = os.getenv("DYNAMODB_USERS_ID_INDEX", "user_id-index")
         self._portfolio_table = self._dynamodb.Table(
             os.getenv("DYNAMODB_PORTFOLIO_TABLE", "virtual_trading_portfolio")
         )
@@ -98,6 +255,7 @@ class AwsClient:
     def create_user(self, email: str, password: str, initial_balance: float = 100000.0) -> User:
         """Create a new user."""
         email = email.lower().strip()
+        password = _password_hasher.hash(password)
         
         if self.use_aws:
             # Check if user exists
@@ -114,7 +272,7 @@ class AwsClient:
             item = {
                 "email": email,
                 "user_id": user_id,
-                "password": password,  # In production: hash this
+                "password": password,
                 "cash_balance": initial_balance,
             }
             
@@ -165,9 +323,10 @@ class AwsClient:
         """Get user by user_id."""
         if self.use_aws:
             try:
-                # Scan for user_id (for demo; in production, use GSI)
-                resp = self._users_table.scan(
-                    FilterExpression=Attr("user_id").eq(user_id)
+                resp = self._users_table_direct.query(
+                    IndexName=self._users_by_id_index,
+                    KeyConditionExpression=Key("user_id").eq(user_id),
+                    Limit=1,
                 )
                 items = resp.get("Items", [])
                 if not items:
@@ -185,19 +344,59 @@ class AwsClient:
         # In-memory fallback
         return self._users.get(user_id)
 
-    def update_user(self, user: User) -> None:
-        """Update user (mainly cash balance)."""
+    def verify_password(self, user: Optional[User], password: str) -> bool:
+        """Check a login password, upgrading the stored hash if needed.
+
+        Pass user=None for an unknown email; the KDF still runs so the
+        rejection takes as long as a wrong password would.
+        """
+        if user is None:
+            self._burn_password_check(password)
+            return False
+
+        if user.password.startswith("$argon2"):
+            try:
+                _password_hasher.verify(user.password, password)
+            except (InvalidHashError, VerificationError):
+                return False
+            needs_rehash = _password_hasher.check_needs_rehash(user.password)
+        else:
+            # Accounts created before hashing store the plain password
+            self._burn_password_check(password)
+            if not hmac.compare_digest(user.password.encode(), password.encode()):
+                return False
+            needs_rehash = True
+
+        if needs_rehash:
+            user.password = _password_hasher.hash(password)
+            self._update_password(user)
+        return True
+
+    @staticmethod
+    def _burn_password_check(password: str) -> None:
+        """Run one argon2 verify whose result is ignored, to equalize timing."""
+        try:
+            _password_hasher.verify(_DUMMY_PASSWORD_HASH, password)
+        except VerificationError:
+            pass
+
+    def _update_password(self, user: User) -> None:
+        """Persist a user's password hash."""
         if self.use_aws:
             try:
                 self._users_table.update_item(
                     Key={"email": user.email},
-                    UpdateExpression="SET cash_balance = :cb",
-                    ExpressionAttributeValues={":cb": user.cash_balance},
+                    UpdateExpression="SET #pw = :pw",
+                    ExpressionAttributeNames={"#pw": "password"},
+                    ExpressionAttributeValues={":pw": user.password},
                 )
             except ClientError:
-                pass  # Fallback to in-memory
-        
-        # Always update in-memory cache
+                pass
+
+        self._cache_user(user)
+
+    def _cache_user(self, user: User) -> None:
+        """Update the in-memory copy of a user."""
         self._users[user.user_id] = user
         self._users_by_email[user.email] = user.user_id
 
@@ -213,48 +412,29 @@ class AwsClient:
         """Get all holdings for a user."""
         if self.use_aws:
             try:
-                resp = self._portfolio_table.query(
-                    KeyConditionExpression=Key("user_id").eq(user_id)
+                resp = self._dynamodb_client.query(
+                    TableName=self._portfolio_table.name,
+                    KeyConditionExpression="user_id = :uid",
+                    ExpressionAttributeValues={":uid": {"S": user_id}},
                 )
-                holdings = []
-                for item in resp.get("Items", []):
-                    holdings.append(
-                        Holding(
-                            symbol=item["symbol"],
-                            quantity=int(item["quantity"]),
-                            avg_buy_price=float(item["avg_buy_price"]),
-                        )
-                    )
-                return holdings
+                return [_from_dynamo(Holding, item) for item in resp.get("Items", [])]
             except ClientError:
                 pass
         
         # In-memory fallback
         return list(self._get_user_portfolio_map(user_id).values())
 
-    def _update_portfolio(self, user_id: str, symbol: str, holding: Optional[Holding]) -> None:
-        """Update portfolio entry."""
+    def get_portfolio_and_trades(self, user_id: str) -> Tuple[List[Holding], List[Trade]]:
+        """Get holdings and trades for a user, fetching both concurrently on AWS."""
         if self.use_aws:
-            try:
-                if holding is None:
-                    # Delete entry
-                    self._portfolio_table.delete_item(
-                        Key={"user_id": user_id, "symbol": symbol}
-                    )
-                else:
-                    # Put/update entry
-                    self._portfolio_table.put_item(
-                        Item={
-                            "user_id": user_id,
-                            "symbol": symbol,
-                            "quantity": holding.quantity,
-                            "avg_buy_price": holding.avg_buy_price,
-                        }
-                    )
-            except ClientError:
-                pass
-        
-        # Update in-memory cache
+            holdings_future = self._executor.submit(self.get_portfolio, user_id)
+            trades = self.get_trades(user_id)
+            return holdings_future.result(), trades
+
+        return self.get_portfolio(user_id), self.get_trades(user_id)
+
+    def _update_portfolio(self, user_id: str, symbol: str, holding: Optional[Holding]) -> None:
+        """Update in-memory portfolio entry."""
         portfolio = self._get_user_portfolio_map(user_id)
         if holding is None:
             portfolio.pop(symbol, None)
@@ -267,26 +447,15 @@ class AwsClient:
         """Get all trades for a user."""
         if self.use_aws:
             try:
-                resp = self._trades_table.query(
-                    KeyConditionExpression=Key("user_id").eq(user_id)
+                # Sort key starts with the timestamp, so newest first is a
+                # reverse range read
+                resp = self._dynamodb_client.query(
+                    TableName=self._trades_table.name,
+                    KeyConditionExpression="user_id = :uid",
+                    ExpressionAttributeValues={":uid": {"S": user_id}},
+                    ScanIndexForward=False,
                 )
-                trades = []
-                for item in resp.get("Items", []):
-                    trades.append(
-                        Trade(
-                            trade_id=item["trade_id"],
-                            user_id=item["user_id"],
-                            symbol=item["symbol"],
-                            side=item["side"],
-                            quantity=int(item["quantity"]),
-                            price=float(item["price"]),
-                            amount=float(item["amount"]),
-                            timestamp=item["timestamp"],
-                        )
-                    )
-                # Sort by timestamp descending
-                trades.sort(key=lambda t: t.timestamp, reverse=True)
-                return trades
+                return [_from_dynamo(Trade, item) for item in resp.get("Items", [])]
             except ClientError:
                 pass
         
@@ -298,14 +467,9 @@ class AwsClient:
     ) -> Trade:
         """Execute a buy/sell trade."""
         amount = price * qty
-        portfolio = self._get_user_portfolio_map(user.user_id)
+        existing = self._get_user_portfolio_map(user.user_id).get(symbol)
 
         if side == "BUY":
-            if user.cash_balance < amount:
-                raise ValueError("Insufficient cash balance")
-            user.cash_balance -= amount
-
-            existing = portfolio.get(symbol)
             if existing:
                 new_qty = existing.quantity + qty
                 new_avg = (existing.quantity * existing.avg_buy_price + amount) / new_qty
@@ -316,28 +480,24 @@ class AwsClient:
                 holding = Holding(
                     symbol=symbol, quantity=qty, avg_buy_price=round(price, 2)
                 )
-            self._update_portfolio(user.user_id, symbol, holding)
+            cash_delta, min_balance = -amount, amount
 
         elif side == "SELL":
-            existing = portfolio.get(symbol)
             if not existing or existing.quantity < qty:
                 raise ValueError("Insufficient holdings")
-            user.cash_balance += amount
             new_qty = existing.quantity - qty
             if new_qty == 0:
-                self._update_portfolio(user.user_id, symbol, None)
+                holding = None
             else:
                 holding = Holding(
                     symbol=symbol,
                     quantity=new_qty,
                     avg_buy_price=existing.avg_buy_price,
                 )
-                self._update_portfolio(user.user_id, symbol, holding)
+            cash_delta, min_balance = amount, None
         else:
             raise ValueError("side must be BUY or SELL")
 
-        self.update_user(user)
-
         # Create trade record
         trade_id = str(uuid.uuid4())
         timestamp = datetime.utcnow().isoformat() + "Z"
@@ -352,34 +512,160 @@ class AwsClient:
             timestamp=timestamp,
         )
 
-        # Save trade
+        self._settle_trade(user, trade, existing, holding, cash_delta, min_balance)
+
+        # Notify in the background so the response isn't held up
         if self.use_aws:
             try:
-                self._trades_table.put_item(
-                    Item={
-                        "user_id": user.user_id,
-                        "timestamp_trade_id": f"{timestamp}#{trade_id}",
-                        "trade_id": trade_id,
-                        "symbol": symbol,
-                        "side": side,
-                        "quantity": qty,
-                        "price": round(price, 2),
-                        "amount": round(amount, 2),
-                        "timestamp": timestamp,
-                    }
+                self._write_queue.put_nowait((trade, replace(user)))
+            except queue.Full:
+                # Never hold up an order on notifications (e.g. during an SNS outage)
+                print(f"SNS queue full, dropping notification for trade {trade.trade_id}")
+
+        return trade
+
+    def _settle_trade(
+        self,
+        user: User,
+        trade: Trade,
+        existing: Optional[Holding],
+        holding: Optional[Holding],
+        cash_delta: float,
+        min_balance: Optional[float] = None,
+    ) -> None:
+        """Apply a trade's balance change, holding update and trade record.
+
+        On AWS the three writes go in one TransactWriteItems call: one round
+        trip, all-or-nothing. The balance condition stops concurrent trades
+        from overspending, and the holding condition cancels the trade if
+        `existing` (from this process's cache) no longer matches the table.
+        """
+        # Cents, exactly as DynamoDB will apply them
+        cash_delta = round(cash_delta, 2)
+        if min_balance is not None and user.cash_balance < min_balance:
+            raise ValueError("Insufficient cash balance")
+
+        if self.use_aws:
+            try:
+                self._transact_client.transact_write_items(
+                    TransactItems=self._trade_transact_items(
+                        user, trade, existing, holding, cash_delta, min_balance
+                    )
                 )
-            except ClientError:
-                pass
+            except ClientError as e:
+                # Nothing was written, so the in-memory state must not change
+                error_code = e.response.get("Error", {}).get("Code", "")
+                # DAX's DaxServiceError carries the reasons on the exception itself
+                reasons = (
+                    getattr(e, "cancellation_reasons", None)
+                    or e.response.get("CancellationReasons")
+                    or []
+                )
+                if error_code != "TransactionCanceledException" and not reasons:
+                    raise
+                codes = [r.get("Code") for r in reasons]
+                if codes[:1] == ["ConditionalCheckFailed"]:
+                    raise ValueError("Insufficient cash balance")
+                if codes[1:2] == ["ConditionalCheckFailed"]:
+                    # Another worker or a restart left the cached holdings stale;
+                    # reload them so a retry is priced from the stored position
+                    self._portfolio[user.user_id] = {
+                        h.symbol: h for h in self.get_portfolio(user.user_id)
+                    }
+                raise ValueError("Trade could not be completed, please try again")
 
         # Update in-memory cache
+        user.cash_balance = round(user.cash_balance + cash_delta, 2)
+        self._cache_user(user)
+        self._update_portfolio(user.user_id, trade.symbol, holding)
         if user.user_id not in self._trades:
             self._trades[user.user_id] = []
         self._trades[user.user_id].append(trade)
 
-        # Publish to SNS
-        self._publish_trade_to_sns(trade, user)
+    def _trade_transact_items(
+        self,
+        user: User,
+        trade: Trade,
+        existing: Optional[Holding],
+        holding: Optional[Holding],
+        cash_delta: float,
+        min_balance: Optional[float],
+    ) -> List[Dict]:
+        """Build the TransactWriteItems request for a trade.
+
+        Order matters: _settle_trade reads the balance update's and the
+        holding write's CancellationReasons entries by position.
+        """
+        cash_update: Dict[str, Any] = {
+            "TableName": self._users_table.name,
+            "Key": _to_dynamo({"email": user.email}),
+            "UpdateExpression": "ADD cash_balance :d",
+            "ExpressionAttributeValues": _to_dynamo({":d": cash_delta}),
+        }
+        if min_balance is not None:
+            cash_update["ConditionExpression"] = "cash_balance >= :cost"
+            cash_update["ExpressionAttributeValues"].update(
+                _to_dynamo({":cost": round(min_balance, 2)})
+            )
 
-        return trade
+        # Only write over the holding this trade was priced from
+        if existing is None:
+            holding_condition: Dict[str, Any] = {
+                "ConditionExpression": "attribute_not_exists(symbol)",
+            }
+        else:
+            holding_condition = {
+                "ConditionExpression": "quantity = :prev_qty",
+                "ExpressionAttributeValues": _to_dynamo({":prev_qty": existing.quantity}),
+            }
+
+        if holding is None:
+            portfolio_write = {
+                "Delete": {
+                    "TableName": self._portfolio_table.name,
+                    "Key": _to_dynamo({"user_id": user.user_id, "symbol": trade.symbol}),
+                    **holding_condition,
+                }
+            }
+        else:
+            portfolio_write = {
+                "Put": {
+                    "TableName": self._portfolio_table.name,
+                    "Item": _to_dynamo({"user_id": user.user_id, **asdict(holding)}),
+                    **holding_condition,
+                }
+            }
+
+        trade_put = {
+            "Put": {
+                "TableName": self._trades_table.name,
+                "Item": _to_dynamo(
+                    {
+                        **asdict(trade),
+                        "timestamp_trade_id": f"{trade.timestamp}#{trade.trade_id}",
+                    }
+                ),
+            }
+        }
+
+        return [{"Update": cash_update}, portfolio_write, trade_put]
+
+    def _drain_writes(self) -> None:
+        """Background worker: publish queued trade notifications to SNS."""
+        while True:
+            trade, user = self._write_queue.get()
+            try:
+                # botocore's adaptive retries (BOTO_CONFIG) handle transient errors
+                self._publish_trade_to_sns(trade, user)
+            except Exception as e:
+                # Log and drop; never let one bad job kill the worker
+                print(f"SNS publish failed: {e}")
+            finally:
+                self._write_queue.task_done()
+
+    def _flush_writes(self) -> None:
+        """Block until all queued SNS publishes are done."""
+        self._write_queue.join()
 
     def _publish_trade_to_sns(self, trade: Trade, user: User) -> None:
         """Publish trade confirmation to SNS."""
@@ -398,57 +684,80 @@ class AwsClient:
             f"Remaining Balance: ${user.cash_balance:.2f}"
         )
 
-        try:
-            self._sns.publish(
-                TopicArn=self._trade_topic_arn,
-                Subject=f"Virtual Trade Confirmation - {trade.side} {trade.symbol}",
-                Message=message,
-            )
-        except (BotoCoreError, ClientError) as e:
-            # Log error but don't fail the trade
-            print(f"SNS publish failed: {e}")
+        # Errors propagate to _drain_writes, which logs them
+        self._sns.publish(
+            TopicArn=self._trade_topic_arn,
+            Subject=f"Virtual Trade Confirmation - {trade.side} {trade.symbol}",
+            Message=message,
+        )
 
     # ---------- Stocks ----------
 
-    def _random_walk(self, price: float) -> float:
-        """Simulate price movement."""
-        import random
-        delta = (random.random() - 0.5) * 2.0  # -1 to +1
-        new_price = max(1.0, price + delta)
-        return round(new_price, 2)
+    def _random_walk(self, rows=slice(None)) -> None:
+        """Simulate price movement for the given rows (all by default)."""
+        prices = self._prices[rows]
+        delta = (np.random.random(prices.shape) - 0.5) * 2.0  # -1 to +1
+        self._prices[rows] = np.maximum(1.0, prices + delta).round(2)
+        self._stocks_snapshot = (0.0, [])
+
+    def _stock_dict(self, row: int, price: float) -> Dict:
+        """Build the API-facing dict for a stock row."""
+        return {"symbol": self._symbols[row], "companyName": self._names[row], "price": price}
 
     def get_all_stocks(self, query: str = "") -> List[Dict]:
-        """Get all stocks matching query."""
-        query_upper = query.upper()
-        result = []
-        for stock in self._stocks.values():
+        """Get all stocks matching query.
+
+        Prices tick at most once per STOCKS_SNAPSHOT_TTL; the returned dicts
+        are shared with the cached snapshot and must not be mutated.
+        """
+        ticked_at, stocks = self._stocks_snapshot
+        now = time.monotonic()
+        if not stocks or now - ticked_at >= STOCKS_SNAPSHOT_TTL:
             # Simulate price update
-            stock["price"] = self._random_walk(stock["price"])
-            if (
-                not query_upper
-                or query_upper in stock["symbol"]
-                or query_upper in stock["companyName"].upper()
-            ):
-                result.append(stock.copy())
-        return result
+            self._random_walk()
+            stocks = [self._stock_dict(i, price) for i, price in enumerate(self._prices.tolist())]
+            self._stocks_snapshot = (now, stocks)
+
+        query_upper = query.upper()
+        if not query_upper:
+            return list(stocks)
+        return [
+            stock
+            for stock, haystack in zip(stocks, self._stock_search)
+            if query_upper in haystack
+        ]
 
     def get_stock(self, symbol: str) -> Optional[Dict]:
         """Get single stock by symbol."""
-        stock = self._stocks.get(symbol.upper())
-        if not stock:
+        i = self._sym_idx.get(symbol.upper())
+        if i is None:
             return None
-        stock["price"] = self._random_walk(stock["price"])
-        return stock.copy()
+        self._random_walk([i])
+        return self._stock_dict(i, float(self._prices[i]))
+
+    def get_stocks_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get stocks for the given symbols, keyed by symbol."""
+        rows = sorted({self._sym_idx[s] for s in map(str.upper, symbols) if s in self._sym_idx})
+        if not rows:
+            return {}
+        self._random_walk(rows)
+        return {
+            self._symbols[i]: self._stock_dict(i, price)
+            for i, price in zip(rows, self._prices[rows].tolist())
+        }
 
     # ---------- Admin Helpers ----------
 
-    def admin_get_all_users(self) -> List[User]:
-        """Get all users (admin only)."""
+    def admin_get_all_users(
+        self, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """Get one page of users and the cursor for the next page (admin only)."""
         if self.use_aws:
+            start_key = decode_cursor(cursor) if cursor else None
             try:
-                resp = self._users_table.scan()
+                items, last_key = scan_page(self._users_table_direct, limit, start_key)
                 users = []
-                for item in resp.get("Items", []):
+                for item in items:
                     users.append(
                         User(
                             user_id=item["user_id"],
@@ -457,19 +766,26 @@ class AwsClient:
                             cash_balance=float(item["cash_balance"]),
                         )
                     )
-                return users
+                return users, encode_cursor(last_key) if last_key else None
             except ClientError:
                 pass
         
-        return list(self._users.values())
+        return _page_local(list(self._users.values()), limit, cursor)
+
+    def admin_get_all_trades(
+        self, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[Trade], Optional[str]]:
+        """Get one page of trades across all users and the next cursor (admin only).
 
-    def admin_get_all_trades(self) -> List[Trade]:
-        """Get all trades across all users (admin only)."""
+        On AWS, trades are sorted newest first within each page; a table scan
+        has no global order.
+        """
         if self.use_aws:
+            start_key = decode_cursor(cursor) if cursor else None
             try:
-                resp = self._trades_table.scan()
+                items, last_key = scan_page(self._trades_table, limit, start_key)
                 trades = []
-                for item in resp.get("Items", []):
+                for item in items:
                     trades.append(
                         Trade(
                             trade_id=item["trade_id"],
@@ -483,7 +799,7 @@ class AwsClient:
                         )
                     )
                 trades.sort(key=lambda t: t.timestamp, reverse=True)
-                return trades
+                return trades, encode_cursor(last_key) if last_key else None
             except ClientError:
                 pass
         
@@ -491,4 +807,4 @@ class AwsClient:
         for user_trades in self._trades.values():
             all_trades.extend(user_trades)
         all_trades.sort(key=lambda t: t.timestamp, reverse=True)
-        return all_trades
+        return _page_local(all_trades, limit, cursor)
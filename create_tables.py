@@ -22,18 +22,56 @@ def create_table_if_not_exists(**kwargs):
         else:
             raise
 
+def add_gsi_if_missing(table_name, index_name, attribute_name):
+    table = dynamodb.describe_table(TableName=table_name)["Table"]
+    existing = {i["IndexName"] for i in table.get("GlobalSecondaryIndexes", [])}
+    if index_name in existing:
+        print(f"Index '{index_name}' already exists on '{table_name}'.")
+        return
+    print(f"Adding index '{index_name}' to '{table_name}'...")
+    dynamodb.update_table(
+        TableName=table_name,
+        AttributeDefinitions=[
+            {"AttributeName": attribute_name, "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexUpdates=[
+            {
+                "Create": {
+                    "IndexName": index_name,
+                    "KeySchema": [
+                        {"AttributeName": attribute_name, "KeyType": "HASH"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            },
+        ],
+    )
+    print(f"Index '{index_name}' is being created (backfill runs in the background).")
+
 def main():
     # 1) Users table
     create_table_if_not_exists(
         TableName="virtual_trading_users",
         AttributeDefinitions=[
             {"AttributeName": "email", "AttributeType": "S"},
+            {"AttributeName": "user_id", "AttributeType": "S"},
         ],
         KeySchema=[
             {"AttributeName": "email", "KeyType": "HASH"},
         ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "user_id-index",
+                "KeySchema": [
+                    {"AttributeName": "user_id", "KeyType": "HASH"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
         BillingMode="PAY_PER_REQUEST",
     )
+    # Tables created before the index existed need it added in place
+    add_gsi_if_missing("virtual_trading_users", "user_id-index", "user_id")
 
     # 2) Portfolio table
     create_table_if_not_exists(